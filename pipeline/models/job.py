@@ -1,10 +1,14 @@
 """Job model for tracking pipeline jobs."""
 
+import re
 from datetime import datetime
 from typing import Optional, Dict, Any
 from enum import Enum
 from pydantic import BaseModel, Field
 
+# Job IDs as generated by DatabaseManager.create_job: {code}_{YYYYMMDD}_{HHMMSS}
+JOB_ID_RE = re.compile(r"^([a-z]+)_(\d{8})_(\d{6})$")
+
 
 class JobStatus(str, Enum):
     """Job status enum."""
@@ -6,6 +6,7 @@ import time
 import hashlib
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs
 import requests
 from bs4 import BeautifulSoup
 
@@ -16,6 +17,12 @@ from pipeline.models.section import SectionCreate
 
 logger = logging.getLogger(__name__)
 
+# Patterns applied to every tree node and section while crawling
+_SECTION_NUM_RE = re.compile(r"sectionNum=([^&]+)")
+_SECTION_LABEL_RE = re.compile(r'^(\d+(?:\.\d+)?[a-z]?)\.?$')
+_INDENT_RE = re.compile(r'margin-left:(\d+)px')
+_HIERARCHY_KEYS = ("division", "part", "chapter", "article")
+
 
 class ArchitectureCrawler:
     """Crawler for extracting code architecture and section URLs (Stage 1)."""
@@ -200,7 +207,7 @@ class ArchitectureCrawler:
 
             # Get indentation level
             style = text_div.get('style', '')
-            indent_match = re.search(r'margin-left:(\d+)px', style)
+            indent_match = _INDENT_RE.search(style)
             indent = int(indent_match.group(1)) if indent_match else 0
             level = max(0, (indent - 10) // 10)
 
@@ -289,7 +296,7 @@ class ArchitectureCrawler:
             for h6 in soup.find_all('h6'):
                 text = h6.get_text(strip=True)
                 # Match section numbers like "1.", "1.5.", "1798.24a.", etc.
-                match = re.match(r'^(\d+(?:\.\d+)?[a-z]?)\.?$', text)
+                match = _SECTION_LABEL_RE.match(text)
                 if match:
                     section_num = match.group(1)
                     if section_num not in seen_sections:
@@ -306,7 +313,7 @@ class ArchitectureCrawler:
                 link = h6.find('a')
                 if link:
                     text = link.get_text(strip=True)
-                    match = re.match(r'^(\d+(?:\.\d+)?[a-z]?)\.?$', text)
+                    match = _SECTION_LABEL_RE.match(text)
                     if match:
                         section_num = match.group(1)
                         if section_num not in seen_sections:
@@ -334,33 +341,14 @@ class ArchitectureCrawler:
         Returns:
             Dictionary with division, part, chapter, article
         """
+        # One pass over the query string instead of a regex per level;
+        # parse_qs also decodes '+' to spaces
+        query = parse_qs(urlparse(url).query)
         hierarchy = {
-            "division": None,
-            "part": None,
-            "chapter": None,
-            "article": None,
+            key: query.get(key, [None])[0]
+            for key in _HIERARCHY_KEYS
         }
 
-        # Extract division
-        division_match = re.search(r"division=([^&]+)", url)
-        if division_match:
-            hierarchy["division"] = division_match.group(1).replace("+", " ")
-
-        # Extract part
-        part_match = re.search(r"part=([^&]+)", url)
-        if part_match:
-            hierarchy["part"] = part_match.group(1).replace("+", " ")
-
-        # Extract chapter
-        chapter_match = re.search(r"chapter=([^&]+)", url)
-        if chapter_match:
-            hierarchy["chapter"] = chapter_match.group(1).replace("+", " ")
-
-        # Extract article
-        article_match = re.search(r"article=([^&]+)", url)
-        if article_match:
-            hierarchy["article"] = article_match.group(1).replace("+", " ")
-
         return hierarchy
 
     def _extract_section_number(self, url: str) -> Optional[str]:
@@ -372,7 +360,7 @@ class ArchitectureCrawler:
         Returns:
             Section number or None
         """
-        match = re.search(r"sectionNum=([^&]+)", url)
+        match = _SECTION_NUM_RE.search(url)
         if match:
             return match.group(1)
         return None
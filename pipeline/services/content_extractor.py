@@ -1,5 +1,6 @@
 """Content extractor for Stage 2: Batch section content extraction."""
 
+import asyncio
 import logging
 from typing import List, Dict, Optional, Callable
 from datetime import datetime
@@ -235,6 +236,32 @@ class ContentExtractor:
 
         return result
 
+    async def extract_async(
+        self,
+        code: str,
+        skip_multi_version: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        """Run extract() in a worker thread so several codes can run concurrently.
+
+        Firecrawl and MongoDB calls are blocking, so the work is offloaded with
+        asyncio.to_thread instead of blocking the event loop.
+
+        Args:
+            code: Code abbreviation (e.g., 'EVID', 'FAM')
+            skip_multi_version: If True, skip multi-version sections (for Stage 3)
+            progress_callback: Optional callback function(processed, total)
+
+        Returns:
+            Same dictionary as extract()
+        """
+        return await asyncio.to_thread(
+            self.extract,
+            code,
+            skip_multi_version=skip_multi_version,
+            progress_callback=progress_callback
+        )
+
     def extract_multi_version_sections(
         self,
         code: str,
@@ -3,13 +3,35 @@ Content parsing utilities for California legal code sections
 Extracts section content and legislative history from Firecrawl markdown
 """
 
+import functools
 import re
 from typing import Dict, Optional, Tuple
 
+_HISTORY_RE = re.compile(r'_\(([^)]+)\)_')
+_SECTION_NUM_RE = re.compile(r'sectionNum=([^&]+)')
+
 
 class ContentParser:
     """Parser for extracting section content from Firecrawl markdown"""
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _section_re_for(section: str) -> re.Pattern:
+        """
+        Compiled header pattern for a section, cached per section number
+
+        Args:
+            section: Section number (e.g., "400", "3044")
+
+        Returns:
+            Pattern capturing everything from the section header to the next
+            section/chapter header or end of input
+        """
+        return re.compile(
+            rf'#{{6}}\s+\*\*{re.escape(section)}\.?\*\*\s*\n\n(.+?)(?=\n#{{5,6}}|\Z)',
+            re.DOTALL
+        )
+
     @staticmethod
     def extract_section_content(markdown: str, section: str) -> Tuple[str, Optional[str]]:
         """
@@ -24,8 +46,7 @@ class ContentParser:
             Returns ("", None) if section not found
         """
         # Pattern: Match from section header to next section/chapter or end
-        section_pattern = rf'#{{6}}\s+\*\*{re.escape(section)}\.?\*\*\s*\n\n(.+?)(?=\n#{{5,6}}|\Z)'
-        match = re.search(section_pattern, markdown, re.DOTALL)
+        match = ContentParser._section_re_for(section).search(markdown)
 
         if not match:
             # Try alternative line-based extraction
@@ -115,8 +136,7 @@ class ContentParser:
         Returns:
             List of legislative history strings
         """
-        history_pattern = r'_\(([^)]+)\)_'
-        return re.findall(history_pattern, markdown)
+        return _HISTORY_RE.findall(markdown)
 
     @staticmethod
     def normalize_text(text: str) -> str:
@@ -175,5 +195,5 @@ class ContentParser:
         Returns:
             Section number or None
         """
-        match = re.search(r'sectionNum=([^&]+)', url)
+        match = _SECTION_NUM_RE.search(url)
         return match.group(1) if match else None
@@ -5,6 +5,7 @@ Wrapper around Firecrawl API for California Legal Codes scraping
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
 from firecrawl import FirecrawlApp
 from pipeline.core.config import settings
@@ -99,22 +100,52 @@ class FirecrawlService:
         """
         Scrape multiple URLs in batch
 
+        Kept for existing callers; runs batch_scrape_urls with its default
+        batch size. New code should call batch_scrape_urls directly.
+
         Args:
             urls: List of URLs to scrape
             formats: Output formats
 
         Returns:
-            List of scrape results
+            List of scrape results, or an empty list if the batch fails
         """
+        return self.batch_scrape_urls(urls, formats=formats)
+
+    def batch_scrape_urls(
+        self,
+        urls: List[str],
+        batch_size: int = 5,
+        formats: List[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Scrape multiple URLs, issuing up to batch_size requests at a time
+
+        Preferred batch entry point. Per-URL failures come back as
+        unsuccessful results; if the batch itself fails, the error is
+        logged and an empty list is returned.
+
+        Args:
+            urls: List of URLs to scrape
+            batch_size: Number of URLs scraped concurrently per chunk
+            formats: Output formats
+
+        Returns:
+            List of scrape results (in same order as input URLs), or an
+            empty list if the batch fails
+        """
+        if not urls:
+            return []
+
         try:
             formats = formats or ["markdown", "html"]
-            logger.info(f"Batch scraping {len(urls)} URLs")
+            logger.info(f"Batch scraping {len(urls)} URLs in chunks of {batch_size}")
 
-            # Firecrawl batch scrape
             results = []
-            for url in urls:
-                result = self.scrape_url(url, formats=formats)
-                results.append(result)
+            with ThreadPoolExecutor(max_workers=batch_size) as executor:
+                for i in range(0, len(urls), batch_size):
+                    chunk = urls[i:i + batch_size]
+                    results.extend(executor.map(lambda url: self.scrape_url(url, formats=formats), chunk))
 
             successful = sum(1 for r in results if r.get("success"))
             logger.info(f"Batch scrape complete: {successful}/{len(urls)} successful")
@@ -0,0 +1 @@
+"""Helpers for seeding test and development databases"""
@@ -0,0 +1,40 @@
+"""
+Seed helpers for development databases
+Restores pre-serialized section documents from a BSON dump
+"""
+
+import logging
+from pathlib import Path
+from typing import Union
+
+import bson
+
+from pipeline.core.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def restore_sections(db: DatabaseManager, path: Union[str, Path]) -> int:
+    """
+    Insert the section documents stored in a BSON dump
+
+    The dump is a plain concatenation of BSON documents, as written by
+    ``mongodump --collection=section_contents``. Documents are inserted
+    as-is with a single ``insert_many`` call, skipping model validation.
+
+    Args:
+        db: Connected database manager
+        path: Path to the .bson file
+
+    Returns:
+        Number of sections inserted
+    """
+    with open(path, 'rb') as f:
+        docs = bson.decode_all(f.read())
+
+    if not docs:
+        return 0
+
+    result = db.sections.insert_many(docs, ordered=False)
+    logger.info(f"Restored {len(result.inserted_ids)} sections from {path}")
+    return len(result.inserted_ids)
@@ -7,12 +7,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from pipeline.core.database import DatabaseManager
 from pipeline.services.content_extractor import ContentExtractor
 from pipeline.services.firecrawl_service import FirecrawlService
-from pipeline.models.section import SectionCreate
+from pipeline.testing.seed import restore_sections
 from pipeline.models.code import CodeCreate, CodeUpdate
-from datetime import datetime
+import asyncio
+import functools
 import logging
+import os
+import time
 
-logging.basicConfig(level=logging.INFO)
+# Default to WARNING; set STAGE2_LOG=INFO (or DEBUG) for per-section logs.
+# force=True because imported services already configured the root logger.
+logging.basicConfig(level=getattr(logging, os.environ.get('STAGE2_LOG', 'WARNING').upper()), force=True)
 logger = logging.getLogger(__name__)
 
 print('='*80)
@@ -25,22 +30,13 @@ db = DatabaseManager()
 db.connect()
 logger.info('✅ Connected to MongoDB')
 
-# Create test sections manually (from YAML test data)
-test_sections = [
-    {'code': 'EVID', 'section': '100', 'url': 'https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=100&lawCode=EVID'},
-    {'code': 'EVID', 'section': '110', 'url': 'https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=110&lawCode=EVID'},
-    {'code': 'EVID', 'section': '120', 'url': 'https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=120&lawCode=EVID'},
-    {'code': 'FAM', 'section': '1', 'url': 'https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=1&lawCode=FAM'},
-    {'code': 'FAM', 'section': '400', 'url': 'https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=400&lawCode=FAM'},
-]
+# Restore test sections from the BSON seed (from YAML test data)
+SEED_PATH = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'seed' / 'sections.bson'
 
-# Clear and create sections
+# Clear and restore sections
 db.sections.delete_many({'code': {'$in': ['EVID', 'FAM']}})
-logger.info(f'Creating {len(test_sections)} test sections...')
-for sec in test_sections:
-    section_create = SectionCreate(**sec)
-    db.create_section(section_create)
-logger.info(f'✅ Created {len(test_sections)} sections')
+restored = restore_sections(db, SEED_PATH)
+logger.info(f'✅ Restored {restored} sections')
 
 # Update code metadata
 db.codes.delete_many({'code': {'$in': ['EVID', 'FAM']}})
@@ -62,49 +58,61 @@ extractor = ContentExtractor(
 )
 
 # Track progress
-def progress_callback(processed, total):
+def progress_callback(code, processed, total):
     pct = (processed/total*100) if total > 0 else 0
-    print(f'   Progress: {processed}/{total} ({pct:.1f}%)')
+    print(f'   [{code}] Progress: {processed}/{total} ({pct:.1f}%)')
 
-# Run Stage 2 for EVID
-start_time = datetime.now()
-result_evid = extractor.extract('EVID', skip_multi_version=True, progress_callback=progress_callback)
-duration_evid = (datetime.now() - start_time).total_seconds()
+# Run Stage 2 for EVID and FAM concurrently (Firecrawl-bound, no shared state)
+CODES = ['EVID', 'FAM']
 
-print()
-print('✅ EVID EXTRACTION COMPLETE')
-print(f'   Duration: {duration_evid:.2f} seconds')
-print(f'   Single-version: {result_evid["single_version_count"]}')
-print(f'   Multi-version: {result_evid["multi_version_count"]}')
-print(f'   Failed: {len(result_evid["failed_sections"])}')
 
-# Run Stage 2 for FAM
-print()
-print('🚀 Starting Stage 2 for FAM sections...')
-print()
-start_time = datetime.now()
-result_fam = extractor.extract('FAM', skip_multi_version=True, progress_callback=progress_callback)
-duration_fam = (datetime.now() - start_time).total_seconds()
+async def run_code(code, semaphore):
+    async with semaphore:
+        start = time.perf_counter()
+        result = await extractor.extract_async(
+            code, skip_multi_version=True, progress_callback=functools.partial(progress_callback, code)
+        )
+        return result, time.perf_counter() - start
 
-print()
-print('✅ FAM EXTRACTION COMPLETE')
-print(f'   Duration: {duration_fam:.2f} seconds')
-print(f'   Single-version: {result_fam["single_version_count"]}')
-print(f'   Multi-version: {result_fam["multi_version_count"]}')
-print(f'   Failed: {len(result_fam["failed_sections"])}')
+
+async def run_codes(codes, max_concurrent=2):
+    semaphore = asyncio.Semaphore(max_concurrent)
+    return await asyncio.gather(*(run_code(code, semaphore) for code in codes))
+
+
+results = asyncio.run(run_codes(CODES))
+
+for code, (result, duration) in zip(CODES, results):
+    print()
+    print(f'✅ {code} EXTRACTION COMPLETE')
+    print(f'   Duration: {duration:.2f} seconds')
+    print(f'   Single-version: {result["single_version_count"]}')
+    print(f'   Multi-version: {result["multi_version_count"]}')
+    print(f'   Failed: {len(result["failed_sections"])}')
 
 # Show extracted content
 print()
 print('📝 Extracted Content Samples:')
-sections_with_content = list(db.sections.find({'content': {'$ne': None}}).limit(3))
+# Only preview slices cross the wire, not the full content
+sections_with_content = list(db.sections.aggregate([
+    {'$match': {'content': {'$ne': None}}},
+    {'$limit': 3},
+    {'$project': {
+        'code': 1,
+        'section': 1,
+        'content_length': {'$strLenCP': {'$ifNull': ['$content', '']}},
+        'content_preview': {'$substrCP': [{'$ifNull': ['$content', '']}, 0, 100]},
+        'history_preview': {'$substrCP': [{'$ifNull': ['$legislative_history', '']}, 0, 80]},
+    }},
+]))
 for i, sec in enumerate(sections_with_content, 1):
     print(f'   {i}. {sec["code"]} §{sec["section"]}')
-    if sec.get('content'):
-        print(f'      Content: {len(sec["content"])} chars')
-        preview = sec["content"][:100].replace('\n', ' ')
+    if sec['content_preview']:
+        print(f'      Content: {sec["content_length"]} chars')
+        preview = sec['content_preview'].replace('\n', ' ')
         print(f'      Preview: {preview}...')
-    if sec.get('legislative_history'):
-        history = sec["legislative_history"][:80].replace('\n', ' ')
+    if sec['history_preview']:
+        history = sec['history_preview'].replace('\n', ' ')
         print(f'      History: {history}...')
     print()
 
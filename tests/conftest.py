@@ -2,25 +2,159 @@
 Pytest configuration and fixtures
 """
 
+import functools
+import os
+import uuid
 import pytest
 import yaml
 from pathlib import Path
 from pipeline.services.firecrawl_service import FirecrawlService
+from tests.mocks.mock_firecrawl import shared_call_log_path
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
-@pytest.fixture
-def test_sections_data():
-    """Load test sections data from YAML file"""
-    data_file = Path(__file__).parent / "fixtures" / "test_sections_data.yaml"
-    with open(data_file, 'r') as f:
-        data = yaml.safe_load(f)
+
+TEST_SECTIONS_FILE = Path(__file__).parent / "fixtures" / "test_sections_data.yaml"
+URL_TMPL = "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={section}&lawCode={code}"
+
+
+@functools.lru_cache(maxsize=None)
+def load_test_sections():
+    """Parse the YAML test data once per process
+
+    Shared by fixtures and test generation; deep-copy before mutating.
+    """
+    with open(TEST_SECTIONS_FILE, 'rb') as f:
+        data = yaml.load(f, Loader=_Loader)
     return data['test_sections']
 
 
-@pytest.fixture
+def _single_version(sections):
+    return [s for s in sections if not s.get('is_multi_version', False)]
+
+
+def _multi_version(sections):
+    return [s for s in sections if s.get('is_multi_version', False)]
+
+
+def _with_history(sections):
+    return [s for s in _single_version(sections) if s.get('legislative_history')]
+
+
+def pytest_configure(config):
+    """Pin the xdist run id up-front so the controller knows the mock call log"""
+    if hasattr(config.option, "testrunuid") and not hasattr(config, "workerinput"):
+        config.option.testrunuid = config.option.testrunuid or uuid.uuid4().hex
+
+
+def pytest_unconfigure(config):
+    """Remove the mock call log shared by xdist workers once the run is over"""
+    run_id = getattr(config.option, "testrunuid", None)
+    if run_id and not hasattr(config, "workerinput"):
+        try:
+            os.remove(shared_call_log_path(run_id))
+        except FileNotFoundError:
+            pass
+
+
+# Test arguments parametrized with one case per YAML section
+_SECTION_PARAMS = {
+    "single_version_section": _single_version,
+    "multi_version_section": _multi_version,
+    "history_section": _with_history,
+}
+
+
+def _section_param(section):
+    """One YAML section as a test case; `known_failure` entries are xfail"""
+    marks = ()
+    reason = section.get('known_failure')
+    if reason:
+        marks = pytest.mark.xfail(
+            reason=reason if isinstance(reason, str) else "known extraction failure",
+            strict=False
+        )
+    return pytest.param(section, marks=marks, id=f"{section['code']}-{section['section']}")
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize per-section YAML tests so each section is its own test"""
+    for argname, select in _SECTION_PARAMS.items():
+        if argname in metafunc.fixturenames:
+            metafunc.parametrize(
+                argname,
+                [_section_param(s) for s in select(load_test_sections())]
+            )
+
+
+@pytest.fixture(scope="session")
+def test_sections_data():
+    """Test sections data from the YAML file, loaded once per session"""
+    return load_test_sections()
+
+
+@pytest.fixture(scope="session")
+def section_urls(test_sections_data):
+    """Section page URL for every YAML section, keyed by (code, section)"""
+    return {
+        (s['code'], s['section']): URL_TMPL.format(code=s['code'], section=s['section'])
+        for s in test_sections_data
+    }
+
+
+@pytest.fixture(scope="session")
+def single_version_sections(test_sections_data):
+    """Single-version sections from the YAML test data"""
+    return _single_version(test_sections_data)
+
+
+@pytest.fixture(scope="session")
+def multi_version_sections(test_sections_data):
+    """Multi-version sections from the YAML test data"""
+    return _multi_version(test_sections_data)
+
+
+@pytest.fixture(scope="session")
+def db_manager_session():
+    """Connect to MongoDB once per session
+
+    connect() builds the collection indexes, so they exist before any
+    test writes and are not rebuilt per test.
+    """
+    from pipeline.core.database import DatabaseManager
+
+    db = DatabaseManager()
+    db.connect()
+    yield db
+    db.disconnect()
+
+
+@pytest.fixture(scope="session")
 def firecrawl_service():
-    """Create FirecrawlService instance"""
-    return FirecrawlService()
+    """Create FirecrawlService instance shared across the session
+
+    scrape_url is memoized per URL and options, so each page is fetched at
+    most once per session. Failed scrapes are not cached.
+    """
+    service = FirecrawlService()
+    scrape_url = service.scrape_url
+    cache = {}
+
+    @functools.wraps(scrape_url)
+    def cached_scrape_url(url, formats=None, max_age=None, **kwargs):
+        key = (url, tuple(formats or ("markdown", "html")), max_age)
+        if key not in cache:
+            result = scrape_url(url, formats=formats, max_age=max_age, **kwargs)
+            if not result.get("success"):
+                return result
+            cache[key] = result
+        return cache[key]
+
+    service.scrape_url = cached_scrape_url
+    return service
 
 
 @pytest.fixture
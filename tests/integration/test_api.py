@@ -1,14 +1,21 @@
 """Integration tests for FastAPI endpoints."""
 
 import pytest
-from fastapi.testclient import TestClient
-from pipeline.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+    """Create one test client for the session.
+
+    The app is imported here rather than at module level so collection and
+    deselected runs skip the FastAPI import. The context manager runs the
+    app lifespan once, so the database connection is shared by every test.
+    """
+    from fastapi.testclient import TestClient
+    from pipeline.main import app
+
+    with TestClient(app) as c:
+        yield c
 
 
 class TestHealthEndpoint:
@@ -48,24 +55,35 @@ class TestCrawlerEndpoints:
     - Running MongoDB instance
     """
 
+    @pytest.fixture
+    def created_jobs(self):
+        """Collect job IDs created by a test and delete them afterwards."""
+        job_ids = []
+        yield job_ids
+        if job_ids:
+            from pipeline.core.database import get_db_manager
+            get_db_manager().jobs.delete_many({"job_id": {"$in": job_ids}})
+
     @pytest.mark.skip(reason="Requires valid API key and takes time")
-    def test_start_crawler(self, client):
+    def test_start_crawler(self, client, created_jobs):
         """Test starting a crawler job."""
         response = client.post("/api/v2/crawler/start/WIC")
 
         assert response.status_code == 200
         data = response.json()
+        created_jobs.append(data["job_id"])
         assert data["code"] == "WIC"
         assert data["status"] == "started"
         assert "job_id" in data
 
     @pytest.mark.skip(reason="Requires valid API key and takes time")
-    def test_get_job_status(self, client):
+    def test_get_job_status(self, client, created_jobs):
         """Test getting job status."""
         # First create a job
         start_response = client.post("/api/v2/crawler/start/WIC")
         assert start_response.status_code == 200
         job_id = start_response.json()["job_id"]
+        created_jobs.append(job_id)
 
         # Then check status
         status_response = client.get(f"/api/v2/crawler/status/{job_id}")
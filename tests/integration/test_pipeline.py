@@ -10,7 +10,6 @@ import pytest
 from pipeline.services.architecture_crawler import ArchitectureCrawler
 from pipeline.services.content_extractor import ContentExtractor
 from pipeline.services.firecrawl_service import FirecrawlService
-from pipeline.core.database import DatabaseManager
 
 
 @pytest.mark.integration
@@ -19,16 +18,13 @@ class TestPipelineIntegration:
     """Integration tests for the full pipeline."""
 
     @pytest.fixture
-    def db_manager(self):
-        """Create a database manager for testing.
+    def db_manager(self, db_manager_session):
+        """Database manager for testing, shared across the session.
 
         Note: This uses the MongoDB instance specified in .env
         For production tests, consider using a separate test database.
         """
-        db = DatabaseManager()
-        db.connect()
-        yield db
-        db.disconnect()
+        return db_manager_session
 
     @pytest.fixture
     def firecrawl_service(self):
@@ -7,6 +7,45 @@ import pytest
 import re
 from pipeline.services.firecrawl_service import FirecrawlService
 from pipeline.services.content_parser import ContentParser
+from tests.conftest import URL_TMPL
+
+
+_HISTORY_RE = re.compile(r'_\(([^)]+)\)_')
+_BOUNDARY_RE = re.compile(r'^(?:_|##)', re.MULTILINE)
+_SECTION_RE_CACHE: dict[str, re.Pattern] = {}
+
+
+SINGLE_VERSION_CASES = [
+    {
+        "code": "FAM",
+        "section": "1",
+        "expected_content_snippet": "This code shall be known as the Family Code",
+        "expected_history_snippet": "Stats. 1992"
+    },
+    {
+        "code": "CCP",
+        "section": "165",
+        "expected_content_snippet": "The justices of the Supreme Court",
+        "expected_history_snippet": "Stats. 1967"
+    },
+    {
+        "code": "PEN",
+        "section": "692",
+        "expected_content_snippet": "Lawful resistance",
+        "expected_history_snippet": "Enacted 1872"
+    },
+]
+
+
+def _section_re(section):
+    """Return the compiled header pattern for a section, compiling it once"""
+    pattern = _SECTION_RE_CACHE.get(section)
+    if pattern is None:
+        pattern = _SECTION_RE_CACHE[section] = re.compile(
+            rf'#{{6}}\s+\*\*{re.escape(section)}\.?\*\*\s*\n\n(.+?)(?=\n_\(|$)',
+            re.DOTALL
+        )
+    return pattern
 
 
 @pytest.mark.integration
@@ -17,74 +56,64 @@ class TestSectionExtraction:
     def extract_section_content(self, markdown, section):
         """Helper to extract section content from markdown"""
         # Try pattern 1: Section with header
-        section_pattern = rf'#{{6}}\s+\*\*{section}\.?\*\*\s*\n\n(.+?)(?=\n_\(|$)'
-        match = re.search(section_pattern, markdown, re.DOTALL)
+        match = _section_re(section).search(markdown)
 
         if match:
             return match.group(1).strip()
 
-        # Try pattern 2: Line-based extraction
-        lines = markdown.split('\n')
-        capture = False
-        content_lines = []
-
-        for line in lines:
-            if f'**{section}.**' in line or f'**{section}' in line:
-                capture = True
-                continue
-            if capture:
-                if line.startswith('_') or line.startswith('##'):
-                    break
-                if line.strip():
-                    content_lines.append(line)
+        # Try pattern 2: Take everything after the header line up to the
+        # first line starting with '_' or '##'
+        start = markdown.find(f'**{section}')
+        if start < 0:
+            return ''
+        start = markdown.find('\n', start)
+        if start < 0:
+            return ''
+
+        body = _BOUNDARY_RE.split(markdown[start + 1:], maxsplit=1)[0]
+        content_lines = [line for line in body.split('\n') if line.strip()]
 
         return '\n'.join(content_lines).strip()
 
     def extract_legislative_history(self, markdown):
         """Helper to extract legislative history"""
-        history_pattern = r'_\(([^)]+)\)_'
-        history_matches = re.findall(history_pattern, markdown)
+        # Scan back from the last ')_' for its opening '_('
+        end = markdown.rfind(')_')
+        if end == -1:
+            return None
+        start = markdown.rfind('_(', 0, end)
+        if start == -1:
+            return None
+        history = markdown[start + 2:end]
+        if history and ')' not in history:
+            return history
+
+        history_matches = _HISTORY_RE.findall(markdown)
         if history_matches:
             return history_matches[-1]
         return None
 
-    @pytest.mark.parametrize("test_data", [
-        pytest.param(
-            {
-                "code": "FAM",
-                "section": "1",
-                "expected_content_snippet": "This code shall be known as the Family Code",
-                "expected_history_snippet": "Stats. 1992"
-            },
-            id="FAM_1"
-        ),
-        pytest.param(
-            {
-                "code": "CCP",
-                "section": "165",
-                "expected_content_snippet": "The justices of the Supreme Court",
-                "expected_history_snippet": "Stats. 1967"
-            },
-            id="CCP_165"
-        ),
-        pytest.param(
-            {
-                "code": "PEN",
-                "section": "692",
-                "expected_content_snippet": "Lawful resistance",
-                "expected_history_snippet": "Enacted 1872"
-            },
-            id="PEN_692"
-        ),
-    ])
-    def test_extract_single_version_sections(self, firecrawl_service, test_data):
+    @pytest.fixture(scope="class")
+    def scraped_single_version(self, firecrawl_service):
+        """Batch-scrape every single-version case once, keyed by (code, section)"""
+        keys = [(case["code"], case["section"]) for case in SINGLE_VERSION_CASES]
+        urls = [URL_TMPL.format(code=code, section=section) for code, section in keys]
+        results = firecrawl_service.batch_scrape_urls(urls)
+        assert len(results) == len(keys), f"Batch scrape returned {len(results)} of {len(keys)} results"
+        return dict(zip(keys, results))
+
+    @pytest.mark.parametrize(
+        "test_data",
+        SINGLE_VERSION_CASES,
+        ids=[f"{case['code']}_{case['section']}" for case in SINGLE_VERSION_CASES]
+    )
+    def test_extract_single_version_sections(self, scraped_single_version, test_data):
         """Test extracting single-version sections"""
         code = test_data["code"]
         section = test_data["section"]
-        url = f"https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={section}&lawCode={code}"
 
-        # Scrape the section
-        result = firecrawl_service.scrape_url(url)
+        # Scraped once for the whole class
+        result = scraped_single_version[(code, section)]
 
         assert result["success"], f"Failed to scrape {code} {section}"
 
@@ -107,7 +136,7 @@ class TestSectionExtraction:
 
     def test_extract_fam_400_complex_section(self, firecrawl_service):
         """Test extracting FAM 400 with complex subsections"""
-        url = "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=400&lawCode=FAM"
+        url = URL_TMPL.format(code="FAM", section="400")
 
         result = firecrawl_service.scrape_url(url)
         assert result["success"]
@@ -129,16 +158,19 @@ class TestSectionExtraction:
     @pytest.mark.multi_version
     def test_detect_multi_version_fam_3044(self, firecrawl_service):
         """Test detecting multi-version section FAM 3044"""
-        url = "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=3044&lawCode=FAM"
+        url = URL_TMPL.format(code="FAM", section="3044")
 
         result = firecrawl_service.scrape_url(url)
         assert result["success"]
 
-        markdown = result["data"].get("markdown", "")
-        source_url = result["data"].get("metadata", {}).get("url", "")
+        data = result["data"]
+        markdown = data.get("markdown") or ""
+        meta = data.get("metadata") or {}
+        source_url = meta.get("url", "")
 
         # Check if redirected to multi-version selector
-        is_multi_version = "selectFromMultiples" in source_url.lower() or \
+        is_multi_version = "selectFromMultiples" in source_url or \
+                          "selectfrommultiples" in source_url or \
                           "selectFromMultiples" in markdown
 
         assert is_multi_version, "FAM 3044 should be detected as multi-version"
@@ -146,16 +178,19 @@ class TestSectionExtraction:
     @pytest.mark.multi_version
     def test_detect_multi_version_ccp_35(self, firecrawl_service):
         """Test detecting multi-version section CCP 35"""
-        url = "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=35&lawCode=CCP"
+        url = URL_TMPL.format(code="CCP", section="35")
 
         result = firecrawl_service.scrape_url(url)
         assert result["success"]
 
-        markdown = result["data"].get("markdown", "")
-        source_url = result["data"].get("metadata", {}).get("url", "")
+        data = result["data"]
+        markdown = data.get("markdown") or ""
+        meta = data.get("metadata") or {}
+        source_url = meta.get("url", "")
 
         # Check if redirected to multi-version selector
-        is_multi_version = "selectFromMultiples" in source_url.lower() or \
+        is_multi_version = "selectFromMultiples" in source_url or \
+                          "selectfrommultiples" in source_url or \
                           "selectFromMultiples" in markdown
 
         assert is_multi_version, "CCP 35 should be detected as multi-version"
@@ -169,10 +204,7 @@ class TestBatchExtraction:
     def test_batch_extract_fam_sections(self, firecrawl_service):
         """Test batch extraction of multiple FAM sections"""
         sections = ["1", "270", "355"]
-        urls = [
-            f"https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={s}&lawCode=FAM"
-            for s in sections
-        ]
+        urls = [URL_TMPL.format(code="FAM", section=s) for s in sections]
 
         results = firecrawl_service.batch_scrape(urls)
 
@@ -190,10 +222,7 @@ class TestBatchExtraction:
             ("PEN", "692")
         ]
 
-        urls = [
-            f"https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={s}&lawCode={c}"
-            for c, s in test_cases
-        ]
+        urls = [URL_TMPL.format(code=c, section=s) for c, s in test_cases]
 
         results = firecrawl_service.batch_scrape(urls)
 
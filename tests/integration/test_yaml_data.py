@@ -6,6 +6,20 @@ Validates extraction against known good data from test_sections_data.yaml
 import pytest
 import re
 from pipeline.services.firecrawl_service import FirecrawlService
+from pipeline.services.multi_version_handler import MultiVersionHandler
+
+# Linear-time DFA matching when google-re2 is installed; these patterns use
+# no lookarounds or backreferences, so the stdlib engine is a drop-in fallback
+try:
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+
+_HISTORY_RE = _regex.compile(r'_\(([^)]+)\)_')
+_YEAR_RE = _regex.compile(r'(\d{4})')
+# Stdlib re on purpose: re2's \s is ASCII-only and would miss non-breaking spaces
+_WS_RE = re.compile(r'\s+')
 
 
 @pytest.mark.integration
@@ -15,321 +29,199 @@ class TestYAMLDataValidation:
 
     def extract_section_content(self, markdown, section):
         """Helper to extract section content"""
-        section_pattern = rf'#{{6}}\s+\*\*{section}\.?\*\*\s*\n\n(.+?)(?=\n_\(|$)'
-        match = re.search(section_pattern, markdown, re.DOTALL)
-
-        if match:
-            return match.group(1).strip()
-
-        # Alternative line-based extraction
-        lines = markdown.split('\n')
-        capture = False
-        content_lines = []
-
-        for line in lines:
-            if f'**{section}.**' in line or f'**{section}' in line:
-                capture = True
-                continue
-            if capture:
-                if line.startswith('_') or line.startswith('##'):
-                    break
-                if line.strip():
-                    content_lines.append(line)
-
-        return '\n'.join(content_lines).strip()
+        # Prefer the h6 section header, then any bold section marker; the
+        # body runs from the end of that line to the next history or
+        # heading line. Plain str.find scans, so always linear.
+        for needle in (f'###### **{section}.**', f'###### **{section}**',
+                       f'**{section}.**', f'**{section}'):
+            idx = markdown.find(needle)
+            if idx >= 0:
+                break
+        else:
+            return ''
+
+        start = markdown.find('\n', idx)
+        if start < 0:
+            return ''
+
+        ends = [i for i in (markdown.find('\n_(', start), markdown.find('\n##', start)) if i >= 0]
+        return markdown[start:min(ends, default=len(markdown))].strip()
 
     def normalize_text(self, text):
         """Normalize text for comparison"""
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        # Remove newlines
-        text = text.replace('\n', ' ')
-        return text.strip()
-
-    def test_single_version_sections(self, firecrawl_service, test_sections_data):
-        """Test all single-version sections from YAML data"""
-        # Filter single-version sections
-        single_version = [s for s in test_sections_data if not s.get('is_multi_version', False)]
-
-        failures = []
-        successes = 0
-
-        for section_data in single_version:
-            code = section_data['code']
-            section = section_data['section']
-            expected_content = section_data.get('content', '').strip()
-
-            # Skip if no expected content
-            if not expected_content:
-                continue
-
-            url = f"https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={section}&lawCode={code}"
-
-            try:
-                result = firecrawl_service.scrape_url(url)
-
-                if not result["success"]:
-                    failures.append(f"{code} {section}: API call failed")
-                    continue
-
-                markdown = result["data"].get("markdown", "")
-                extracted_content = self.extract_section_content(markdown, section)
-
-                if not extracted_content:
-                    failures.append(f"{code} {section}: No content extracted")
-                    continue
-
-                # Normalize both texts for comparison
-                normalized_expected = self.normalize_text(expected_content)
-                normalized_extracted = self.normalize_text(extracted_content)
-
-                # Check if extracted content starts with expected content
-                # (allowing for extra content after the main text)
-                if not normalized_extracted.startswith(normalized_expected[:100]):
-                    failures.append(
-                        f"{code} {section}: Content mismatch\n"
-                        f"  Expected: {normalized_expected[:100]}...\n"
-                        f"  Got: {normalized_extracted[:100]}..."
-                    )
-                    continue
-
-                successes += 1
-
-            except Exception as e:
-                failures.append(f"{code} {section}: Exception - {str(e)}")
-
-        # Print results
-        total = len([s for s in single_version if s.get('content')])
-        print(f"\n\nResults: {successes}/{total} sections validated successfully")
-
-        if failures:
-            print("\nFailures:")
-            for failure in failures:
-                print(f"  - {failure}")
-
-        # Assert at least 80% success rate
-        if total > 0:
-            success_rate = successes / total
-            assert success_rate >= 0.8, \
-                f"Success rate too low: {success_rate:.1%} ({successes}/{total})\n" + \
-                "\n".join(failures)
+        # Collapse all whitespace runs (including newlines) to single spaces
+        return _WS_RE.sub(' ', text).strip()
+
+    @staticmethod
+    def _batch_scrape(firecrawl_service, section_urls, sections):
+        """Batch-scrape the given sections once, keyed by (code, section)"""
+        keys = [(s['code'], s['section']) for s in sections]
+        results = firecrawl_service.batch_scrape_urls([section_urls[key] for key in keys])
+        assert len(results) == len(keys), f"Batch scrape returned {len(results)} of {len(keys)} results"
+        return dict(zip(keys, results))
+
+    @pytest.fixture(scope="class")
+    def scraped_single_version(self, firecrawl_service, section_urls, single_version_sections):
+        """Every single-version section scraped up-front in batches"""
+        return self._batch_scrape(firecrawl_service, section_urls, single_version_sections)
+
+    @pytest.fixture(scope="class")
+    def scraped_multi_version(self, firecrawl_service, section_urls, multi_version_sections):
+        """Every multi-version section scraped up-front in batches"""
+        return self._batch_scrape(firecrawl_service, section_urls, multi_version_sections)
+
+    def test_single_version_section(self, scraped_single_version, single_version_section):
+        """Test a single-version section from YAML data"""
+        code = single_version_section['code']
+        section = single_version_section['section']
+        expected_content = single_version_section.get('content', '').strip()
+
+        if not expected_content:
+            pytest.skip(f"{code} {section}: no expected content")
+
+        result = scraped_single_version[(code, section)]
+        if not result["success"]:
+            pytest.fail(f"{code} {section}: API call failed")
+
+        markdown = result["data"].get("markdown", "")
+        extracted_content = self.extract_section_content(markdown, section)
+
+        if not extracted_content:
+            pytest.fail(f"{code} {section}: No content extracted")
+
+        # Normalize both texts for comparison
+        normalized_expected = self.normalize_text(expected_content)
+        normalized_extracted = self.normalize_text(extracted_content)
+
+        # Check if extracted content starts with expected content
+        # (allowing for extra content after the main text)
+        if not normalized_extracted.startswith(normalized_expected[:100]):
+            pytest.fail(
+                f"{code} {section}: Content mismatch\n"
+                f"  Expected: {normalized_expected[:100]}...\n"
+                f"  Got: {normalized_extracted[:100]}..."
+            )
 
     @pytest.mark.multi_version
-    def test_multi_version_detection(self, firecrawl_service, test_sections_data):
+    def test_multi_version_detection(self, scraped_multi_version, multi_version_section):
         """Test multi-version section detection from YAML data"""
-        # Filter multi-version sections
-        multi_version = [s for s in test_sections_data if s.get('is_multi_version', False)]
-
-        failures = []
-        successes = 0
-
-        for section_data in multi_version:
-            code = section_data['code']
-            section = section_data['section']
-            url = f"https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={section}&lawCode={code}"
-
-            try:
-                result = firecrawl_service.scrape_url(url)
-
-                if not result["success"]:
-                    failures.append(f"{code} {section}: API call failed")
-                    continue
-
-                markdown = result["data"].get("markdown", "")
-                source_url = result["data"].get("metadata", {}).get("url", "")
-
-                # Check if detected as multi-version
-                is_multi_version = "selectFromMultiples" in source_url.lower() or \
-                                  "selectFromMultiples" in markdown
-
-                if not is_multi_version:
-                    failures.append(f"{code} {section}: Not detected as multi-version")
-                    continue
+        code = multi_version_section['code']
+        section = multi_version_section['section']
 
-                successes += 1
+        result = scraped_multi_version[(code, section)]
+        if not result["success"]:
+            pytest.fail(f"{code} {section}: API call failed")
 
-            except Exception as e:
-                failures.append(f"{code} {section}: Exception - {str(e)}")
+        data = result["data"]
+        markdown = data.get("markdown") or ""
+        meta = data.get("metadata") or {}
+        source_url = meta.get("url", "")
 
-        total = len(multi_version)
-        print(f"\n\nMulti-version detection: {successes}/{total} sections detected")
+        # Check if detected as multi-version
+        is_multi_version = "selectFromMultiples" in source_url or \
+                          "selectfrommultiples" in source_url or \
+                          "selectFromMultiples" in markdown
 
-        if failures:
-            print("\nFailures:")
-            for failure in failures:
-                print(f"  - {failure}")
+        if not is_multi_version:
+            pytest.fail(f"{code} {section}: Not detected as multi-version")
 
-        # Assert 100% detection for multi-version sections
-        assert successes == total, \
-            f"Multi-version detection failed for {total - successes} sections:\n" + \
-            "\n".join(failures)
+    @pytest.fixture(scope="class")
+    def multi_version_handler(self):
+        """Multi-version handler shared by the content extraction cases"""
+        return MultiVersionHandler()
 
     @pytest.mark.multi_version
     @pytest.mark.slow
-    def test_multi_version_content_extraction(self, test_sections_data):
-        """Test extracting actual content for multi-version sections"""
-        from pipeline.services.multi_version_handler import MultiVersionHandler
-
-        handler = MultiVersionHandler()
-
-        # Filter multi-version sections
-        multi_version = [s for s in test_sections_data if s.get('is_multi_version', False)]
-
-        failures = []
-        successes = 0
-
-        for section_data in multi_version:
-            code = section_data['code']
-            section = section_data['section']
-            expected_versions = section_data.get('versions', [])
-
-            try:
-                # Extract all versions
-                result = handler.extract_all_versions(code, section)
-
-                if not result.get("is_multi_version"):
-                    failures.append(f"{code} {section}: Not detected as multi-version")
-                    continue
-
-                actual_versions = result.get("versions", [])
-
-                # Validate version count
-                if len(actual_versions) != len(expected_versions):
-                    failures.append(
-                        f"{code} {section}: Version count mismatch - "
-                        f"expected {len(expected_versions)}, got {len(actual_versions)}"
-                    )
-                    continue
-
-                # Validate each version's content
-                all_versions_valid = True
-                for i, expected in enumerate(expected_versions):
-                    if i >= len(actual_versions):
-                        failures.append(f"{code} {section}: Missing version {i+1}")
-                        all_versions_valid = False
-                        break
-
-                    actual = actual_versions[i]
-                    expected_content = self.normalize_text(expected.get('content', '').strip())
-                    actual_content = self.normalize_text(actual.get('content', ''))
-
-                    # Validate content exists and matches expected
-                    if not actual_content:
-                        failures.append(f"{code} {section} v{i+1}: No content extracted")
-                        all_versions_valid = False
-                        break
-
-                    # Check if content is similar (allow for minor formatting differences)
-                    # Content should be at least 90% of expected length
-                    min_expected_length = len(expected_content) * 0.9
-                    if len(actual_content) < min_expected_length:
-                        failures.append(
-                            f"{code} {section} v{i+1}: Content too short - "
-                            f"expected ~{len(expected_content)} chars, got {len(actual_content)} chars"
-                        )
-                        all_versions_valid = False
-                        break
-
-                    # Check if key phrases from expected content appear in actual
-                    # Use first 100 chars as validation
-                    if expected_content[:100] not in actual_content:
-                        failures.append(
-                            f"{code} {section} v{i+1}: Content mismatch\n"
-                            f"  Expected start: {expected_content[:100]}...\n"
-                            f"  Actual start: {actual_content[:100]}..."
-                        )
-                        all_versions_valid = False
-                        break
-
-                if all_versions_valid:
-                    successes += 1
-
-            except Exception as e:
-                import traceback
-                failures.append(f"{code} {section}: Exception - {str(e)}\n{traceback.format_exc()}")
-
-        total = len(multi_version)
-        print(f"\n\nMulti-version content extraction: {successes}/{total} sections validated")
-
-        if failures:
-            print("\nFailures:")
-            for failure in failures:
-                print(f"  - {failure}")
-
-        # Assert 100% extraction for multi-version sections
-        assert successes == total, \
-            f"Multi-version content extraction failed for {total - successes} sections:\n" + \
-            "\n".join(failures)
-
-    def test_legislative_history_extraction(self, firecrawl_service, test_sections_data):
-        """Test legislative history extraction from YAML data"""
-        sections_with_history = [
-            s for s in test_sections_data
-            if not s.get('is_multi_version', False) and s.get('legislative_history')
-        ]
-
-        failures = []
-        successes = 0
-
-        for section_data in sections_with_history:
-            code = section_data['code']
-            section = section_data['section']
-            expected_history = section_data['legislative_history']
-
-            url = f"https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={section}&lawCode={code}"
-
-            try:
-                result = firecrawl_service.scrape_url(url)
-
-                if not result["success"]:
-                    failures.append(f"{code} {section}: API call failed")
-                    continue
-
-                markdown = result["data"].get("markdown", "")
-
-                # Extract legislative history
-                history_pattern = r'_\(([^)]+)\)_'
-                history_matches = re.findall(history_pattern, markdown)
-
-                if not history_matches:
-                    failures.append(f"{code} {section}: No legislative history found")
-                    continue
-
-                extracted_history = history_matches[-1]
-
-                # Check if key parts of expected history are present
-                # (normalize and check for key year/stat numbers)
-                expected_normalized = self.normalize_text(expected_history)
-                extracted_normalized = self.normalize_text(extracted_history)
-
-                # Extract year from expected
-                import re as regex
-                year_match = regex.search(r'(\d{4})', expected_normalized)
-                if year_match:
-                    year = year_match.group(1)
-                    if year not in extracted_normalized:
-                        failures.append(
-                            f"{code} {section}: History mismatch (year {year} not found)\n"
-                            f"  Expected: {expected_normalized}\n"
-                            f"  Got: {extracted_normalized}"
-                        )
-                        continue
-
-                successes += 1
-
-            except Exception as e:
-                failures.append(f"{code} {section}: Exception - {str(e)}")
-
-        total = len(sections_with_history)
-        print(f"\n\nLegislative history: {successes}/{total} sections validated")
-
-        if failures:
-            print("\nFailures:")
-            for failure in failures:
-                print(f"  - {failure}")
-
-        # Assert at least 80% success rate
-        if total > 0:
-            success_rate = successes / total
-            assert success_rate >= 0.8, \
-                f"Success rate too low: {success_rate:.1%} ({successes}/{total})"
+    def test_multi_version_content_extraction(self, multi_version_handler, multi_version_section):
+        """Test extracting actual content for a multi-version section"""
+        code = multi_version_section['code']
+        section = multi_version_section['section']
+        expected_versions = multi_version_section.get('versions', [])
+
+        # Extract all versions
+        result = multi_version_handler.extract_all_versions(code, section)
+
+        if not result.get("is_multi_version"):
+            pytest.fail(f"{code} {section}: Not detected as multi-version")
+
+        actual_versions = result.get("versions", [])
+
+        # Validate version count
+        if len(actual_versions) != len(expected_versions):
+            pytest.fail(
+                f"{code} {section}: Version count mismatch - "
+                f"expected {len(expected_versions)}, got {len(actual_versions)}"
+            )
+
+        # Validate each version's content
+        for i, expected in enumerate(expected_versions):
+            actual = actual_versions[i]
+            raw_expected = expected.get('content', '').strip()
+            raw_actual = actual.get('content', '')
+
+            # Cheap gates on the raw text before paying for normalization
+            if not raw_actual.strip():
+                pytest.fail(f"{code} {section} v{i+1}: No content extracted")
+            if len(raw_actual) < len(raw_expected) * 0.5:
+                pytest.fail(
+                    f"{code} {section} v{i+1}: Content too short - "
+                    f"expected ~{len(raw_expected)} chars, got {len(raw_actual)} chars"
+                )
+
+            expected_content = self.normalize_text(raw_expected)
+            actual_content = self.normalize_text(raw_actual)
+
+            # Check if content is similar (allow for minor formatting differences)
+            # Content should be at least 90% of expected length
+            min_expected_length = len(expected_content) * 0.9
+            if len(actual_content) < min_expected_length:
+                pytest.fail(
+                    f"{code} {section} v{i+1}: Content too short - "
+                    f"expected ~{len(expected_content)} chars, got {len(actual_content)} chars"
+                )
+
+            # Check if key phrases from expected content appear in actual
+            # Use first 100 chars as validation
+            needle = expected_content[:100]
+            if needle not in actual_content:
+                pytest.fail(
+                    f"{code} {section} v{i+1}: Content mismatch\n"
+                    f"  Expected start: {needle}...\n"
+                    f"  Actual start: {actual_content[:100]}..."
+                )
+
+    def test_legislative_history_extraction(self, firecrawl_service, section_urls, history_section):
+        """Test legislative history extraction for a section from YAML data"""
+        code = history_section['code']
+        section = history_section['section']
+        expected_history = history_section['legislative_history']
+
+        result = firecrawl_service.scrape_url(section_urls[(code, section)])
+        if not result["success"]:
+            pytest.fail(f"{code} {section}: API call failed")
+
+        markdown = result["data"].get("markdown", "")
+
+        # Extract legislative history
+        history_matches = _HISTORY_RE.findall(markdown)
+
+        if not history_matches:
+            pytest.fail(f"{code} {section}: No legislative history found")
+
+        extracted_history = history_matches[-1]
+
+        # Check if key parts of expected history are present
+        # (normalize and check for key year/stat numbers)
+        expected_normalized = self.normalize_text(expected_history)
+        extracted_normalized = self.normalize_text(extracted_history)
+
+        # Extract year from expected
+        year_match = _YEAR_RE.search(expected_normalized)
+        if year_match:
+            year = year_match.group(1)
+            if year not in extracted_normalized:
+                pytest.fail(
+                    f"{code} {section}: History mismatch (year {year} not found)\n"
+                    f"  Expected: {expected_normalized}\n"
+                    f"  Got: {extracted_normalized}"
+                )
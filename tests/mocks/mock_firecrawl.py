@@ -5,9 +5,24 @@ Provides realistic mock responses without hitting real API endpoints.
 """
 
 from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+import os
+import tempfile
 import time
 
 
+def shared_call_log_path(run_id: str) -> str:
+    """Path of the call log shared by all pytest-xdist workers of one run"""
+    return os.path.join(tempfile.gettempdir(), f"firecrawl-mock-calls-{run_id}.log")
+
+
+def _worker_call_log() -> Optional[str]:
+    """Shared call log when running inside an xdist worker, else None"""
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        return None
+    return shared_call_log_path(os.environ.get("PYTEST_XDIST_TESTRUNUID", "default"))
+
+
 class MockFirecrawlApp:
     """Mock Firecrawl API client for testing"""
     
@@ -15,11 +30,24 @@ class MockFirecrawlApp:
         self.api_key = api_key
         self.scrape_calls = []
         self.scrape_delay = 0.0  # Simulate API latency
+        self.shared_log = _worker_call_log()
+    
+    def _record_call(self, url: str, params: Optional[Dict] = None):
+        """Record a call locally and, under xdist, in the shared call log"""
+        self.scrape_calls.append((url, params))
+        
+        if self.shared_log:
+            # One O_APPEND write per call, so lines from workers never interleave
+            fd = os.open(self.shared_log, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, f"{url}\n".encode())
+            finally:
+                os.close(fd)
     
     def scrape_url(self, url: str, params: Optional[Dict] = None) -> Dict:
         """Mock scrape_url method"""
         # Record the call
-        self.scrape_calls.append((url, params))
+        self._record_call(url, params)
         
         # Simulate API delay
         if self.scrape_delay > 0:
@@ -33,19 +61,19 @@ class MockFirecrawlApp:
         else:
             return self._mock_default_response(url, params)
     
+    def batch_scrape_urls(self, urls: List[str], params: Optional[Dict] = None) -> List[Dict]:
+        """Mock batch scrape - maps scrape_url over the inputs"""
+        return [self.scrape_url(url, params) for url in urls]
+    
     def _mock_section_response(self, url: str, params: Optional[Dict] = None) -> Dict:
         """Generate mock response for section pages"""
-        # Extract section number from URL
-        import re
-        section_match = re.search(r'sectionNum=([^&]+)', url)
-        section_num = section_match.group(1) if section_match else "1"
-        
-        # Extract code from URL
-        code_match = re.search(r'lawCode=([^&]+)', url)
-        code = code_match.group(1) if code_match else "TEST"
+        # Extract section number and code from URL query
+        query = parse_qs(urlparse(url).query)
+        section_num = query.get('sectionNum', ['1'])[0]
+        code = query.get('lawCode', ['TEST'])[0]
         
         # Check if multi-version (sections ending in 44 or 35)
-        is_multi_version = section_num.endswith('44') or section_num.endswith('35')
+        is_multi_version = section_num[-2:] in ('44', '35')
         
         if is_multi_version:
             return {
@@ -80,10 +108,8 @@ _(Added by Stats. 2023, Ch. 100, Sec. 1. Operative January 1, 2024.)_
     
     def _mock_architecture_response(self, url: str, params: Optional[Dict] = None) -> Dict:
         """Generate mock response for architecture pages"""
-        # Extract code from URL
-        import re
-        code_match = re.search(r'tocCode=([^&]+)', url)
-        code = code_match.group(1) if code_match else "TEST"
+        # Extract code from URL query
+        code = parse_qs(urlparse(url).query).get('tocCode', ['TEST'])[0]
         
         # Generate mock text page links
         num_divisions = 5
@@ -124,6 +150,16 @@ _(Added by Stats. 2023, Ch. 100, Sec. 1. Operative January 1, 2024.)_
         """Get number of scrape_url calls"""
         return len(self.scrape_calls)
     
+    def get_total_call_count(self) -> int:
+        """Get number of scrape_url calls across all xdist workers"""
+        if not self.shared_log:
+            return len(self.scrape_calls)
+        try:
+            with open(self.shared_log, "rb") as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+    
     def reset(self):
         """Reset call history"""
         self.scrape_calls = []
@@ -134,33 +170,33 @@ class MockFirecrawlError(MockFirecrawlApp):
     
     def scrape_url(self, url: str, params: Optional[Dict] = None) -> Dict:
         """Always raise an error"""
-        self.scrape_calls.append((url, params))
+        self._record_call(url, params)
         raise Exception("Mock API error: Service unavailable")
 
 
 class MockFirecrawlRateLimited(MockFirecrawlApp):
-    """Mock Firecrawl that simulates rate limiting"""
+    """Mock Firecrawl that simulates rate limiting with a token bucket"""
     
     def __init__(self, api_key: str = "test-key", max_calls_per_second: int = 2):
         super().__init__(api_key)
         self.max_calls_per_second = max_calls_per_second
-        self.call_times = []
+        self.tokens = float(max_calls_per_second)
+        self.last_refill = time.monotonic()
     
-    def scrape_url(self, url: str, params: Optional[Dict] = None) -> Dict:
-        """Enforce rate limiting"""
-        import time
+    def _take_token(self):
+        """Refill the bucket for elapsed time, then spend one token"""
+        now = time.monotonic()
+        self.tokens = min(
+            self.max_calls_per_second,
+            self.tokens + (now - self.last_refill) * self.max_calls_per_second
+        )
+        self.last_refill = now
         
-        current_time = time.time()
-        
-        # Remove calls older than 1 second
-        self.call_times = [t for t in self.call_times if current_time - t < 1.0]
-        
-        # Check if rate limited
-        if len(self.call_times) >= self.max_calls_per_second:
+        if self.tokens < 1:
             raise Exception("Rate limit exceeded: 429 Too Many Requests")
-        
-        # Record call time
-        self.call_times.append(current_time)
-        
+        self.tokens -= 1
+    
+    def scrape_url(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """Enforce rate limiting"""
+        self._take_token()
         return super().scrape_url(url, params)
-
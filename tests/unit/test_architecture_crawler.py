@@ -1,5 +1,7 @@
 """Unit tests for Architecture Crawler."""
 
+import re
+
 import pytest
 from pipeline.services.architecture_crawler import ArchitectureCrawler
 
@@ -68,6 +70,13 @@ class TestArchitectureCrawler:
         assert hierarchy["part"] is None
         assert hierarchy["chapter"] == "1"
 
+    def test_patterns_are_compiled(self):
+        """Test URL parsing patterns are precompiled at module level."""
+        from pipeline.services.architecture_crawler import _SECTION_NUM_RE, _SECTION_LABEL_RE
+
+        assert isinstance(_SECTION_NUM_RE, re.Pattern)
+        assert isinstance(_SECTION_LABEL_RE, re.Pattern)
+
     def test_extract_text_page_urls(self, crawler):
         """Test text page URL extraction."""
         links = [
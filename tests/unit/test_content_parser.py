@@ -4,6 +4,46 @@ Unit tests for content parsing functions
 
 import pytest
 import re
+from pipeline.services.content_parser import ContentParser
+
+
+_BASE = "https://leginfo.legislature.ca.gov/faces/"
+
+# (links, substring, expected matches) for the link filtering tests
+LINK_FILTER_CASES = [
+    pytest.param(
+        [
+            _BASE + "codes_displaySection.xhtml?sectionNum=1&lawCode=EVID",
+            _BASE + "codes_displayText.xhtml?lawCode=EVID",
+            "https://example.com/other",
+            _BASE + "codes_displaySection.xhtml?sectionNum=2&lawCode=EVID",
+        ],
+        "codes_displaySection", 2, id="section_links",
+    ),
+    pytest.param(
+        [
+            _BASE + "codes_displayText.xhtml?lawCode=EVID&division=1.",
+            _BASE + "codes_displaySection.xhtml?sectionNum=1&lawCode=EVID",
+            _BASE + "codes_displayText.xhtml?lawCode=EVID&division=2.",
+        ],
+        "codes_displayText", 2, id="text_page_links",
+    ),
+    pytest.param(
+        [
+            _BASE + "codes_displaySection.xhtml?lawCode=FAM&nodeTreePath=1.2.3",
+            _BASE + "codes_displaySection.xhtml?sectionNum=1&lawCode=EVID",
+            _BASE + "codes_displaySection.xhtml?lawCode=FAM&nodeTreePath=1.2.4",
+        ],
+        "nodeTreePath", 2, id="version_links",
+    ),
+    pytest.param(
+        [
+            _BASE + "selectFromMultiples.xhtml",
+            _BASE + "codes_displaySection.xhtml?sectionNum=1",
+        ],
+        "selectFromMultiples", 1, id="multi_version_indicator",
+    ),
+]
 
 
 @pytest.mark.unit
@@ -50,14 +90,6 @@ _(Enacted by Stats. 1965, Ch. 299.)_
         assert len(matches) > 0
         assert "Enacted by Stats. 1965, Ch. 299." in matches[-1]
 
-    def test_extract_multi_version_indicators(self):
-        """Test detecting multi-version sections"""
-        url1 = "https://leginfo.legislature.ca.gov/faces/selectFromMultiples.xhtml"
-        url2 = "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=1"
-
-        assert "selectFromMultiples" in url1
-        assert "selectFromMultiples" not in url2
-
     def test_parse_complex_section_content(self):
         """Test parsing section with subsections"""
         markdown = """
@@ -112,19 +144,10 @@ _(Amended by Stats. 2019, Ch. 115, Sec. 8.)_
 class TestLinkExtraction:
     """Test link extraction logic"""
 
-    def test_filter_section_links(self):
-        """Test filtering section links from all links"""
-        links = [
-            "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=1&lawCode=EVID",
-            "https://leginfo.legislature.ca.gov/faces/codes_displayText.xhtml?lawCode=EVID",
-            "https://example.com/other",
-            "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=2&lawCode=EVID"
-        ]
-
-        section_links = [link for link in links if 'codes_displaySection' in link]
-
-        assert len(section_links) == 2
-        assert all('codes_displaySection' in link for link in section_links)
+    @pytest.mark.parametrize("links,substr,count", LINK_FILTER_CASES)
+    def test_filter_links(self, links, substr, count):
+        """Test filtering links by URL substring"""
+        assert sum(1 for link in links if substr in link) == count
 
     def test_extract_section_number_from_url(self):
         """Test extracting section number from URL"""
@@ -135,28 +158,29 @@ class TestLinkExtraction:
         section_num = match.group(1)
         assert section_num == "400"
 
-    def test_filter_text_page_links(self):
-        """Test filtering text page links"""
-        links = [
-            "https://leginfo.legislature.ca.gov/faces/codes_displayText.xhtml?lawCode=EVID&division=1.",
-            "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=1&lawCode=EVID",
-            "https://leginfo.legislature.ca.gov/faces/codes_displayText.xhtml?lawCode=EVID&division=2."
-        ]
 
-        text_links = [link for link in links if 'codes_displayText' in link]
+@pytest.mark.unit
+class TestContentParserPatterns:
+    """Test ContentParser compiled pattern caching"""
 
-        assert len(text_links) == 2
-        assert all('codes_displayText' in link for link in text_links)
+    def test_section_pattern_is_cached(self):
+        """Test that the per-section pattern is compiled once and reused"""
+        assert ContentParser._section_re_for("400") is ContentParser._section_re_for("400")
+        assert ContentParser._section_re_for("400") is not ContentParser._section_re_for("401")
 
-    def test_filter_version_links(self):
-        """Test filtering multi-version links"""
-        links = [
-            "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?lawCode=FAM&nodeTreePath=1.2.3",
-            "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum=1&lawCode=EVID",
-            "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?lawCode=FAM&nodeTreePath=1.2.4"
-        ]
+    def test_extract_section_content_uses_cached_pattern(self):
+        """Test extraction with the cached pattern"""
+        markdown = """
+###### **400.**
 
-        version_links = [link for link in links if 'nodeTreePath' in link]
+(a) Although marriage is a personal relation arising out of a civil contract.
+
+(b) Consistent with Section 94.5 of the Penal Code.
 
-        assert len(version_links) == 2
-        assert all('nodeTreePath' in link for link in version_links)
+_(Amended by Stats. 2019, Ch. 115, Sec. 8.)_
+"""
+        content, history = ContentParser.extract_section_content(markdown, "400")
+
+        assert "(a)" in content
+        assert "(b)" in content
+        assert history == "Amended by Stats. 2019, Ch. 115, Sec. 8."
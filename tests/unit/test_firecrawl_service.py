@@ -2,100 +2,157 @@
 Unit tests for FirecrawlService
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pipeline.services.firecrawl_service import FirecrawlService
 
 
+@pytest.fixture(scope="module")
+def service():
+    """One FirecrawlService shared by the module; tests stub its SDK calls"""
+    return FirecrawlService()
+
+
+@pytest.fixture
+def fake_scrape(service, monkeypatch):
+    """Replace the SDK's scrape_url with a fresh mock for one test"""
+    mock_scrape = MagicMock(return_value={})
+    monkeypatch.setattr(service.app, "scrape_url", mock_scrape)
+    return mock_scrape
+
+
 @pytest.mark.unit
 class TestFirecrawlService:
     """Test FirecrawlService class"""
 
-    def test_init(self):
+    def test_init(self, service):
         """Test service initialization"""
-        service = FirecrawlService()
         assert service.api_key is not None
         assert service.app is not None
 
-    def test_scrape_url_success(self, mock_firecrawl_response):
+    def test_scrape_url_success(self, service, fake_scrape, mock_firecrawl_response):
         """Test successful URL scraping"""
-        service = FirecrawlService()
+        fake_scrape.return_value = mock_firecrawl_response["data"]
 
-        # Mock the Firecrawl app
-        with patch.object(service.app, 'scrape_url', return_value=mock_firecrawl_response["data"]):
-            result = service.scrape_url("https://example.com")
+        result = service.scrape_url("https://example.com")
 
-            assert result["success"] is True
-            assert "data" in result
-            assert result["data"]["markdown"] == "Sample markdown content"
+        assert result["success"] is True
+        assert "data" in result
+        assert result["data"]["markdown"] == "Sample markdown content"
 
-    def test_scrape_url_failure(self):
+    def test_scrape_url_failure(self, service, fake_scrape):
         """Test URL scraping failure"""
-        service = FirecrawlService()
+        fake_scrape.side_effect = Exception("API Error")
 
-        # Mock a failure
-        with patch.object(service.app, 'scrape_url', side_effect=Exception("API Error")):
-            result = service.scrape_url("https://example.com")
+        result = service.scrape_url("https://example.com")
 
-            assert result["success"] is False
-            assert "error" in result
-            assert "API Error" in result["error"]
+        assert result["success"] is False
+        assert "error" in result
+        assert "API Error" in result["error"]
 
-    def test_scrape_url_with_formats(self):
+    def test_scrape_url_with_formats(self, service, fake_scrape):
         """Test scraping with specific formats"""
-        service = FirecrawlService()
+        service.scrape_url("https://example.com", formats=["markdown", "html"])
 
-        with patch.object(service.app, 'scrape_url', return_value={}) as mock_scrape:
-            service.scrape_url("https://example.com", formats=["markdown", "html"])
+        # Verify formats were passed
+        fake_scrape.assert_called_once()
+        call_args = fake_scrape.call_args
+        assert "params" in call_args[1]
+        assert call_args[1]["params"]["formats"] == ["markdown", "html"]
 
-            # Verify formats were passed
-            mock_scrape.assert_called_once()
-            call_args = mock_scrape.call_args
-            assert "params" in call_args[1]
-            assert call_args[1]["params"]["formats"] == ["markdown", "html"]
-
-    def test_batch_scrape(self):
+    def test_batch_scrape(self, service, monkeypatch):
         """Test batch scraping multiple URLs"""
-        service = FirecrawlService()
         urls = [
             "https://example.com/1",
             "https://example.com/2",
             "https://example.com/3"
         ]
+        mock_scrape = Mock(return_value={"success": True})
+        monkeypatch.setattr(service, "scrape_url", mock_scrape)
 
-        with patch.object(service, 'scrape_url', return_value={"success": True}) as mock_scrape:
-            results = service.batch_scrape(urls)
+        results = service.batch_scrape(urls)
 
-            assert len(results) == 3
-            assert mock_scrape.call_count == 3
+        assert len(results) == 3
+        assert mock_scrape.call_count == 3
 
-    def test_batch_scrape_empty_list(self):
+    def test_batch_scrape_empty_list(self, service):
         """Test batch scraping with empty URL list"""
-        service = FirecrawlService()
         results = service.batch_scrape([])
 
         assert len(results) == 0
 
-    def test_scrape_with_actions(self):
+    def test_batch_scrape_urls_preserves_order(self, service, monkeypatch):
+        """Test chunked batch scraping returns results in input order"""
+        urls = [f"https://example.com/{i}" for i in range(7)]
+        mock_scrape = Mock(side_effect=lambda url, formats=None: {"success": True, "url": url})
+        monkeypatch.setattr(service, "scrape_url", mock_scrape)
+
+        results = service.batch_scrape_urls(urls, batch_size=3)
+
+        assert [r["url"] for r in results] == urls
+        assert mock_scrape.call_count == 7
+
+    @pytest.mark.parametrize("n_urls,batch_size", [(5, 5), (6, 3), (8, 4)])
+    def test_batch_scrape_urls_is_concurrent(self, service, monkeypatch, n_urls, batch_size):
+        """Test each chunk's requests overlap instead of running back to back"""
+        latency = 0.1
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def slow_scrape(url, formats=None):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(latency)
+            with lock:
+                in_flight -= 1
+            return {"success": True, "url": url}
+
+        monkeypatch.setattr(service, "scrape_url", slow_scrape)
+        urls = [f"https://example.com/{i}" for i in range(n_urls)]
+
+        start = time.perf_counter()
+        results = service.batch_scrape_urls(urls, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        assert [r["url"] for r in results] == urls
+        assert peak == batch_size
+        # Serially this would take n_urls * latency
+        assert elapsed < n_urls * latency * 0.75
+
+    def test_batch_scrape_urls_empty_list(self, service):
+        """Test chunked batch scraping with empty URL list"""
+        assert service.batch_scrape_urls([]) == []
+
+    @pytest.mark.parametrize("method", ["batch_scrape", "batch_scrape_urls"])
+    def test_batch_scrape_failure_returns_empty(self, service, monkeypatch, method):
+        """Test both batch entry points log a failed batch and return []"""
+        monkeypatch.setattr(service, "scrape_url", Mock(side_effect=RuntimeError("boom")))
+
+        assert getattr(service, method)(["https://example.com/1"]) == []
+
+    def test_scrape_with_actions(self, service, fake_scrape):
         """Test scraping with page actions"""
-        service = FirecrawlService()
         actions = [
             {"type": "wait", "milliseconds": 1000},
             {"type": "click", "selector": ".button"}
         ]
 
-        with patch.object(service.app, 'scrape_url', return_value={}) as mock_scrape:
-            service.scrape_with_actions("https://example.com", actions)
+        service.scrape_with_actions("https://example.com", actions)
 
-            # Verify actions were passed
-            mock_scrape.assert_called_once()
-            call_args = mock_scrape.call_args
-            assert "params" in call_args[1]
-            assert call_args[1]["params"]["actions"] == actions
+        # Verify actions were passed
+        fake_scrape.assert_called_once()
+        call_args = fake_scrape.call_args
+        assert "params" in call_args[1]
+        assert call_args[1]["params"]["actions"] == actions
 
-    def test_extract_structured_data(self):
+    def test_extract_structured_data(self, service, fake_scrape):
         """Test structured data extraction"""
-        service = FirecrawlService()
         schema = {
             "type": "object",
             "properties": {
@@ -104,18 +161,17 @@ class TestFirecrawlService:
             }
         }
 
-        with patch.object(service.app, 'scrape_url', return_value={}) as mock_scrape:
-            service.extract_structured_data("https://example.com", schema)
-
-            # Verify schema was passed
-            mock_scrape.assert_called_once()
-            call_args = mock_scrape.call_args
-            assert "params" in call_args[1]
-            assert "formats" in call_args[1]["params"]
-            formats = call_args[1]["params"]["formats"]
-            assert len(formats) == 1
-            assert formats[0]["type"] == "json"
-            assert formats[0]["schema"] == schema
+        service.extract_structured_data("https://example.com", schema)
+
+        # Verify schema was passed
+        fake_scrape.assert_called_once()
+        call_args = fake_scrape.call_args
+        assert "params" in call_args[1]
+        assert "formats" in call_args[1]["params"]
+        formats = call_args[1]["params"]["formats"]
+        assert len(formats) == 1
+        assert formats[0]["type"] == "json"
+        assert formats[0]["schema"] == schema
 
 
 @pytest.mark.unit
@@ -0,0 +1,86 @@
+"""
+Unit tests for the mock Firecrawl clients
+"""
+
+import pytest
+from tests.mocks import mock_firecrawl
+from tests.mocks.mock_firecrawl import MockFirecrawlApp, MockFirecrawlRateLimited
+
+
+SECTION_URL = "https://leginfo.legislature.ca.gov/faces/codes_displaySection.xhtml?sectionNum={}&lawCode=EVID"
+
+
+@pytest.mark.unit
+class TestMockFirecrawlApp:
+    """Test MockFirecrawlApp"""
+
+    def test_batch_scrape_urls(self):
+        """Test batch scrape returns one response per URL, in order"""
+        app = MockFirecrawlApp()
+        urls = [SECTION_URL.format(n) for n in ("100", "144", "120")]
+
+        results = app.batch_scrape_urls(urls, params={"formats": ["markdown"]})
+
+        assert [r["metadata"]["title"] for r in results] == [
+            "EVID Code, Section 100", "EVID Code, Section 144", "EVID Code, Section 120"
+        ]
+        assert "Multiple Versions" in results[1]["markdown"]
+        assert app.get_call_count() == 3
+        assert [url for url, _ in app.scrape_calls] == urls
+
+    def test_total_call_count_across_workers(self, monkeypatch, tmp_path):
+        """Test calls from every xdist worker land in one shared call log"""
+        monkeypatch.setattr(mock_firecrawl.tempfile, "tempdir", str(tmp_path))
+        monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run-1")
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+        first = MockFirecrawlApp()
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        second = MockFirecrawlApp()
+
+        first.scrape_url(SECTION_URL.format("100"))
+        second.scrape_url(SECTION_URL.format("110"))
+        second.scrape_url(SECTION_URL.format("120"))
+
+        assert first.shared_log == second.shared_log == mock_firecrawl.shared_call_log_path("run-1")
+        assert (first.get_call_count(), second.get_call_count()) == (1, 2)
+        assert first.get_total_call_count() == second.get_total_call_count() == 3
+
+    def test_total_call_count_without_xdist(self, monkeypatch):
+        """Test the total falls back to local calls outside xdist workers"""
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        app = MockFirecrawlApp()
+
+        app.scrape_url(SECTION_URL.format("100"))
+
+        assert app.shared_log is None
+        assert app.get_total_call_count() == 1
+
+
+@pytest.mark.unit
+class TestMockFirecrawlRateLimited:
+    """Test MockFirecrawlRateLimited token bucket"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Fake monotonic clock for the mock module; advance via clock[0]"""
+        now = [1000.0]
+        monkeypatch.setattr(mock_firecrawl.time, "monotonic", lambda: now[0])
+        return now
+
+    def test_burst_then_refill(self, clock):
+        """Test a full bucket allows a burst, then refills one call per interval"""
+        app = MockFirecrawlRateLimited(max_calls_per_second=4)
+        url = SECTION_URL.format("100")
+
+        for _ in range(4):
+            app.scrape_url(url)
+
+        with pytest.raises(Exception, match="429"):
+            app.scrape_url(url)
+
+        clock[0] += 1 / 4
+        app.scrape_url(url)
+
+        with pytest.raises(Exception, match="429"):
+            app.scrape_url(url)
+        assert app.get_call_count() == 5
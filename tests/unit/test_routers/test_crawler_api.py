@@ -5,77 +5,181 @@ This is an EXAMPLE implementation showing how to test the crawler API
 following TDD best practices.
 """
 
+import asyncio
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch, MagicMock
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
 from datetime import datetime
 
-from pipeline.main import app
-from pipeline.core.database import DatabaseManager
-from pipeline.services.architecture_crawler import ArchitectureCrawler
-from pipeline.services.content_extractor import ContentExtractor
 from pipeline.models.job import JobStatus
 
+# The app and services are imported inside the fixtures that need them so
+# that collecting this module stays cheap
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from pipeline.core.database import DatabaseManager
+    from pipeline.services.architecture_crawler import ArchitectureCrawler
+    from pipeline.services.content_extractor import ContentExtractor
+
+
+@pytest.fixture(scope="session")
+def app() -> "FastAPI":
+    """FastAPI app under test"""
+    from pipeline.main import app
+
+    return app
+
+
+class _SyncASGITransport(httpx.BaseTransport):
+    """Drive an ASGI app from a sync httpx.Client on one private event loop
+
+    httpx.ASGITransport is async-only, so each request is run to completion
+    on a loop owned by the transport instead of TestClient's portal thread.
+    The app lifespan is entered when the transport is created and exited on
+    close, so startup/shutdown run once for the transport's lifetime.
+    """
+
+    def __init__(self, app: "FastAPI"):
+        self._transport = httpx.ASGITransport(app=app)
+        self._loop = asyncio.new_event_loop()
+        self._lifespan = app.router.lifespan_context(app)
+        try:
+            self._loop.run_until_complete(self._lifespan.__aenter__())
+        except BaseException:
+            self._loop.close()
+            raise
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._loop.run_until_complete(self._send(request))
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        content = await response.aread()
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=content,
+            request=request
+        )
 
-@pytest.fixture
-def client():
-    """Create test client for API testing"""
-    return TestClient(app)
+    def close(self) -> None:
+        try:
+            self._loop.run_until_complete(self._lifespan.__aexit__(None, None, None))
+        finally:
+            self._loop.close()
+
+
+@pytest.fixture(scope="module")
+def client(app) -> httpx.Client:
+    """Create in-process HTTP client for API testing, shared by the module
+
+    Startup and shutdown run once for the module. The lifespan's database
+    hooks are stubbed only until this module finishes, so these unit tests
+    never open a MongoDB connection and later modules see the real hooks;
+    each test patches the router's own get_db_manager via ``mocks``.
+    """
+    from pipeline.core.database import DatabaseManager
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("pipeline.main.get_db_manager", lambda: Mock(spec=DatabaseManager))
+        mp.setattr("pipeline.main.close_db_manager", lambda: None)
+        with httpx.Client(transport=_SyncASGITransport(app), base_url="http://test") as c:
+            yield c
+
+
+# Default return values for the shared mocks, re-applied before every test.
+# The router only reads these payloads, so they are shared rather than copied,
+# and the timestamp is fixed so responses are deterministic
+_DEFAULT_JOB = {
+    "job_id": "job-123",
+    "code": "EVID",
+    "status": JobStatus.RUNNING,
+    "created_at": datetime(2025, 1, 1),
+    "stage_1_complete": False,
+    "stage_2_complete": False,
+    "stage_3_complete": False
+}
+
+_MOCK_DEFAULTS = {
+    "db": {
+        "create_job": "job-123",
+        "get_job": _DEFAULT_JOB,
+        "update_job": True,
+    },
+    "crawler": {
+        "crawl": {
+            "success": True,
+            "code": "EVID",
+            "total_sections": 100,
+            "total_text_pages": 10,
+            "execution_time": 1.5
+        },
+    },
+    "extractor": {
+        "extract": {
+            "success": True,
+            "code": "EVID",
+            "total_sections": 100,
+            "successful": 98,
+            "failed": 2,
+            "single_version_count": 95,
+            "multi_version_count": 3
+        },
+    },
+}
 
+# Router dependency each shared mock stands in for
+_PATCH_TARGETS = {
+    "db": "pipeline.routers.crawler.get_db_manager",
+    "crawler": "pipeline.routers.crawler.ArchitectureCrawler",
+    "extractor": "pipeline.routers.crawler.ContentExtractor",
+}
 
-@pytest.fixture
-def mock_db():
-    """Mock database manager"""
-    db = Mock(spec=DatabaseManager)
-    
-    # Mock common database operations
-    db.create_job.return_value = "job-123"
-    db.get_job.return_value = {
-        "job_id": "job-123",
-        "code": "EVID",
-        "status": JobStatus.PROCESSING,
-        "created_at": datetime.now(),
-        "stage_1_complete": False,
-        "stage_2_complete": False,
-        "stage_3_complete": False
-    }
-    db.update_job.return_value = True
-    
-    return db
 
+@dataclass
+class Mocks:
+    """Spec'd mocks for the crawler router's dependencies"""
 
-@pytest.fixture
-def mock_crawler():
-    """Mock architecture crawler"""
-    crawler = Mock(spec=ArchitectureCrawler)
-    
-    crawler.crawl.return_value = {
-        "success": True,
-        "code": "EVID",
-        "total_sections": 100,
-        "total_text_pages": 10,
-        "execution_time": 1.5
-    }
-    
-    return crawler
+    db: "DatabaseManager"
+    crawler: "ArchitectureCrawler"
+    extractor: "ContentExtractor"
 
 
-@pytest.fixture
-def mock_extractor():
-    """Mock content extractor"""
-    extractor = Mock(spec=ContentExtractor)
-    
-    extractor.extract_all_sections.return_value = {
-        "success": True,
-        "code": "EVID",
-        "total_sections": 100,
-        "successful": 98,
-        "failed": 2,
-        "single_version_count": 95,
-        "multi_version_count": 3
-    }
-    
-    return extractor
+def _apply_defaults(mock, defaults):
+    """Clear recorded calls/side effects and restore default return values"""
+    mock.reset_mock(return_value=True, side_effect=True)
+    for attr, value in defaults.items():
+        getattr(mock, attr).return_value = value
+
+
+@pytest.fixture(scope="module")
+def mocks() -> Mocks:
+    """Router dependency mocks, built once per module"""
+    from pipeline.core.database import DatabaseManager
+    from pipeline.services.architecture_crawler import ArchitectureCrawler
+    from pipeline.services.content_extractor import ContentExtractor
+
+    return Mocks(
+        db=Mock(spec=DatabaseManager),
+        crawler=Mock(spec=ArchitectureCrawler),
+        extractor=Mock(spec=ContentExtractor),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _wire_mocks(request, monkeypatch):
+    """Reset the shared mocks and point the router at them for tests that use them"""
+    if "mocks" not in request.fixturenames:
+        return
+
+    mocks = request.getfixturevalue("mocks")
+    for name, target in _PATCH_TARGETS.items():
+        mock = getattr(mocks, name)
+        _apply_defaults(mock, _MOCK_DEFAULTS[name])
+        monkeypatch.setattr(target, lambda *args, _mock=mock, **kwargs: _mock)
 
 
 @pytest.mark.unit
@@ -102,14 +206,8 @@ class TestHealthEndpoint:
 class TestStartCrawlerEndpoint:
     """Test POST /api/v2/crawler/start/{code}"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    @patch('pipeline.routers.crawler.ArchitectureCrawler')
-    def test_start_crawler_success(self, mock_arch_class, mock_get_db, client, mock_db, mock_crawler):
+    def test_start_crawler_success(self, client, mocks):
         """Test successfully starting a crawler job"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        mock_arch_class.return_value = mock_crawler
-        
         # Act
         response = client.post("/api/v2/crawler/start/EVID")
         
@@ -121,31 +219,10 @@ class TestStartCrawlerEndpoint:
         assert data["status"] == "processing"
         
         # Verify database interaction
-        mock_db.create_job.assert_called_once()
-        call_args = mock_db.create_job.call_args[0][0]
+        mocks.db.create_job.assert_called_once()
+        call_args = mocks.db.create_job.call_args[0][0]
         assert call_args.code == "EVID"
     
-    def test_start_crawler_invalid_code(self, client):
-        """Test that invalid code returns 400"""
-        response = client.post("/api/v2/crawler/start/INVALID123")
-        
-        assert response.status_code == 400
-        assert "error" in response.json()
-    
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_start_crawler_database_error(self, mock_get_db, client, mock_db):
-        """Test that database errors return 500"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.create_job.side_effect = Exception("Database connection failed")
-        
-        # Act
-        response = client.post("/api/v2/crawler/start/EVID")
-        
-        # Assert
-        assert response.status_code == 500
-        assert "error" in response.json()
-    
     def test_start_crawler_empty_code(self, client):
         """Test that empty code returns 400"""
         response = client.post("/api/v2/crawler/start/")
@@ -157,12 +234,8 @@ class TestStartCrawlerEndpoint:
 class TestJobStatusEndpoint:
     """Test GET /api/v2/crawler/status/{job_id}"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_get_job_status_success(self, mock_get_db, client, mock_db):
+    def test_get_job_status_success(self, client, mocks):
         """Test getting job status"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        
         # Act
         response = client.get("/api/v2/crawler/status/job-123")
         
@@ -171,14 +244,12 @@ class TestJobStatusEndpoint:
         data = response.json()
         assert data["job_id"] == "job-123"
         assert data["code"] == "EVID"
-        assert data["status"] == JobStatus.PROCESSING
+        assert data["status"] == JobStatus.RUNNING
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_get_job_status_not_found(self, mock_get_db, client, mock_db):
+    def test_get_job_status_not_found(self, client, mocks):
         """Test getting non-existent job returns 404"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.get_job.return_value = None
+        mocks.db.get_job.return_value = None
         
         # Act
         response = client.get("/api/v2/crawler/status/nonexistent")
@@ -192,14 +263,8 @@ class TestJobStatusEndpoint:
 class TestStage1Endpoint:
     """Test POST /api/v2/crawler/stage1/{code}"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    @patch('pipeline.routers.crawler.ArchitectureCrawler')
-    def test_run_stage1_success(self, mock_arch_class, mock_get_db, client, mock_db, mock_crawler):
+    def test_run_stage1_success(self, client, mocks):
         """Test successfully running Stage 1"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        mock_arch_class.return_value = mock_crawler
-        
         # Act
         response = client.post("/api/v2/crawler/stage1/EVID")
         
@@ -211,16 +276,12 @@ class TestStage1Endpoint:
         assert data["total_sections"] == 100
         
         # Verify crawler was called
-        mock_crawler.crawl.assert_called_once_with("EVID", save_to_db=True)
+        mocks.crawler.crawl.assert_called_once_with("EVID", save_to_db=True)
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    @patch('pipeline.routers.crawler.ArchitectureCrawler')
-    def test_run_stage1_crawler_failure(self, mock_arch_class, mock_get_db, client, mock_db, mock_crawler):
+    def test_run_stage1_crawler_failure(self, client, mocks):
         """Test Stage 1 failure handling"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_arch_class.return_value = mock_crawler
-        mock_crawler.crawl.return_value = {
+        mocks.crawler.crawl.return_value = {
             "success": False,
             "error": "Network timeout"
         }
@@ -237,14 +298,8 @@ class TestStage1Endpoint:
 class TestStage2Endpoint:
     """Test POST /api/v2/crawler/stage2/{code}"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    @patch('pipeline.routers.crawler.ContentExtractor')
-    def test_run_stage2_success(self, mock_ext_class, mock_get_db, client, mock_db, mock_extractor):
+    def test_run_stage2_success(self, client, mocks):
         """Test successfully running Stage 2"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        mock_ext_class.return_value = mock_extractor
-        
         # Act
         response = client.post("/api/v2/crawler/stage2/EVID")
         
@@ -257,14 +312,10 @@ class TestStage2Endpoint:
         assert data["single_version_count"] == 95
         assert data["multi_version_count"] == 3
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    @patch('pipeline.routers.crawler.ContentExtractor')
-    def test_run_stage2_partial_failure(self, mock_ext_class, mock_get_db, client, mock_db, mock_extractor):
+    def test_run_stage2_partial_failure(self, client, mocks):
         """Test Stage 2 with some failed sections"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_ext_class.return_value = mock_extractor
-        mock_extractor.extract_all_sections.return_value = {
+        mocks.extractor.extract.return_value = {
             "success": True,
             "code": "EVID",
             "total_sections": 100,
@@ -287,12 +338,10 @@ class TestStage2Endpoint:
 class TestListJobsEndpoint:
     """Test GET /api/v2/crawler/jobs"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_list_jobs_empty(self, mock_get_db, client, mock_db):
+    def test_list_jobs_empty(self, client, mocks):
         """Test listing jobs when none exist"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.list_jobs.return_value = []
+        mocks.db.list_jobs.return_value = []
         
         # Act
         response = client.get("/api/v2/crawler/jobs")
@@ -301,14 +350,12 @@ class TestListJobsEndpoint:
         assert response.status_code == 200
         assert response.json() == []
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_list_jobs_with_data(self, mock_get_db, client, mock_db):
+    def test_list_jobs_with_data(self, client, mocks):
         """Test listing jobs with multiple jobs"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.list_jobs.return_value = [
+        mocks.db.list_jobs.return_value = [
             {"job_id": "job-1", "code": "EVID", "status": JobStatus.COMPLETED},
-            {"job_id": "job-2", "code": "FAM", "status": JobStatus.PROCESSING},
+            {"job_id": "job-2", "code": "FAM", "status": JobStatus.RUNNING},
         ]
         
         # Act
@@ -321,12 +368,10 @@ class TestListJobsEndpoint:
         assert data[0]["job_id"] == "job-1"
         assert data[1]["job_id"] == "job-2"
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_list_jobs_with_filters(self, mock_get_db, client, mock_db):
+    def test_list_jobs_with_filters(self, client, mocks):
         """Test listing jobs with status filter"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.list_jobs.return_value = [
+        mocks.db.list_jobs.return_value = [
             {"job_id": "job-1", "code": "EVID", "status": JobStatus.COMPLETED},
         ]
         
@@ -344,12 +389,10 @@ class TestListJobsEndpoint:
 class TestDeleteJobEndpoint:
     """Test DELETE /api/v2/crawler/jobs/{job_id}"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_delete_job_success(self, mock_get_db, client, mock_db):
+    def test_delete_job_success(self, client, mocks):
         """Test successfully deleting a job"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.delete_job.return_value = True
+        mocks.db.delete_job.return_value = True
         
         # Act
         response = client.delete("/api/v2/crawler/jobs/job-123")
@@ -360,12 +403,10 @@ class TestDeleteJobEndpoint:
         assert data["success"] is True
         assert data["message"] == "Job deleted"
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_delete_job_not_found(self, mock_get_db, client, mock_db):
+    def test_delete_job_not_found(self, client, mocks):
         """Test deleting non-existent job"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.delete_job.return_value = False
+        mocks.db.delete_job.return_value = False
         
         # Act
         response = client.delete("/api/v2/crawler/jobs/nonexistent")
@@ -403,71 +444,61 @@ class TestRequestValidation:
 class TestConcurrentRequests:
     """Test handling concurrent requests"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    @patch('pipeline.routers.crawler.ArchitectureCrawler')
-    def test_multiple_jobs_can_run_concurrently(
+    async def test_multiple_jobs_can_run_concurrently(
         self, 
-        mock_arch_class, 
-        mock_get_db, 
-        client, 
-        mock_db, 
-        mock_crawler
+        app, 
+        mocks
     ):
         """Test that multiple jobs can be started concurrently"""
         # Arrange
-        mock_get_db.return_value = mock_db
-        mock_arch_class.return_value = mock_crawler
         job_ids = ["job-1", "job-2", "job-3"]
-        mock_db.create_job.side_effect = job_ids
+        mocks.db.create_job.side_effect = job_ids
         
-        # Act - Start 3 jobs
-        responses = [
-            client.post("/api/v2/crawler/start/EVID"),
-            client.post("/api/v2/crawler/start/FAM"),
-            client.post("/api/v2/crawler/start/PEN"),
-        ]
+        # Act - Start 3 jobs at once on the same event loop
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(
+                ac.post("/api/v2/crawler/start/EVID"),
+                ac.post("/api/v2/crawler/start/FAM"),
+                ac.post("/api/v2/crawler/start/PEN"),
+            )
         
         # Assert - All should succeed
         for response in responses:
             assert response.status_code == 200
         
         # Verify 3 jobs were created
-        assert mock_db.create_job.call_count == 3
+        assert mocks.db.create_job.call_count == 3
+
+
+def _no_setup(db):
+    pass
+
+
+def _db_error(db):
+    db.create_job.side_effect = Exception("Database connection failed")
+
+
+def _no_job(db):
+    db.get_job.return_value = None
 
 
 @pytest.mark.unit
 class TestErrorResponseFormat:
     """Test that error responses follow consistent format"""
     
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_500_error_has_error_field(self, mock_get_db, client, mock_db):
-        """Test that 500 errors have consistent format"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.create_job.side_effect = Exception("Unexpected error")
-        
-        # Act
-        response = client.post("/api/v2/crawler/start/EVID")
-        
-        # Assert
-        assert response.status_code == 500
-        data = response.json()
-        assert "error" in data
-        assert isinstance(data["error"], str)
-    
-    @patch('pipeline.routers.crawler.get_db_manager')
-    def test_404_error_has_error_field(self, mock_get_db, client, mock_db):
-        """Test that 404 errors have consistent format"""
-        # Arrange
-        mock_get_db.return_value = mock_db
-        mock_db.get_job.return_value = None
-        
-        # Act
-        response = client.get("/api/v2/crawler/status/nonexistent")
-        
-        # Assert
-        assert response.status_code == 404
+    @pytest.mark.parametrize("setup,method,url,expected_status", [
+        (_no_setup, "POST", "/api/v2/crawler/start/INVALID123", 400),
+        (_db_error, "POST", "/api/v2/crawler/start/EVID", 500),
+        (_no_job, "GET", "/api/v2/crawler/status/nonexistent", 404),
+    ], ids=["invalid_code", "database_error", "job_not_found"])
+    def test_error_response(self, client, mocks, setup, method, url, expected_status):
+        """Test that error responses carry the status and a string error field"""
+        setup(mocks.db)
+        
+        response = client.request(method, url)
+        
+        assert response.status_code == expected_status
         data = response.json()
         assert "error" in data
         assert isinstance(data["error"], str)
-
@@ -0,0 +1,43 @@
+"""
+Unit tests for the BSON section seed helper
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+from pipeline.testing.seed import restore_sections
+
+
+SEED_PATH = Path(__file__).parent.parent / "fixtures" / "seed" / "sections.bson"
+
+
+@pytest.mark.unit
+class TestRestoreSections:
+    """Test restore_sections helper"""
+
+    def test_restore_sections_single_insert(self):
+        """Test that all seed documents are inserted in one call"""
+        db = MagicMock()
+        db.sections.insert_many.side_effect = lambda docs, ordered: MagicMock(
+            inserted_ids=list(range(len(docs)))
+        )
+
+        count = restore_sections(db, SEED_PATH)
+
+        assert count == 5
+        db.sections.insert_many.assert_called_once()
+        docs = db.sections.insert_many.call_args[0][0]
+        assert db.sections.insert_many.call_args[1]["ordered"] is False
+        assert {(d["code"], d["section"]) for d in docs} == {
+            ("EVID", "100"), ("EVID", "110"), ("EVID", "120"), ("FAM", "1"), ("FAM", "400")
+        }
+        assert all("lawCode=" + d["code"] in d["url"] for d in docs)
+
+    def test_restore_sections_empty_dump(self, tmp_path):
+        """Test that an empty dump inserts nothing"""
+        db = MagicMock()
+        empty = tmp_path / "empty.bson"
+        empty.write_bytes(b"")
+
+        assert restore_sections(db, empty) == 0
+        db.sections.insert_many.assert_not_called()